@@ -1,8 +1,24 @@
+from math import hypot
+
+# NumPy нужен только для пакетных операций над векторами (Vector2DBatch)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Numba (если установлен) компилирует редукции по массивам координат в машинный код
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 # Ограничения по координатам
 MAX_WIDTH = 800
 MAX_HEIGHT = 600
 
 class Point2D:
+    __slots__ = ('_x', '_y')
+
     def __init__(self, x: int, y: int):
         self.x = x
         self.y = y
@@ -38,6 +54,9 @@ class Point2D:
 
 
 class Vector2D:
+    # _len — закэшированная длина, сбрасывается при изменении координат
+    __slots__ = ('_x', '_y', '_len')
+
     def __init__(self, a, b=None):
         if isinstance(a, Point2D) and isinstance(b, Point2D):
             self._x = b.x - a.x
@@ -45,18 +64,19 @@ class Vector2D:
         else:
             self._x = int(a)
             self._y = int(b)
+        self._len = None
 
     @property
     def x(self): return self._x
 
     @x.setter
-    def x(self, value): self._x = int(value)
+    def x(self, value): self._x, self._len = int(value), None
 
     @property
     def y(self): return self._y
 
     @y.setter
-    def y(self, value): self._y = int(value)
+    def y(self, value): self._y, self._len = int(value), None
 
     def __getitem__(self, i):
         if i == 0: return self._x
@@ -67,6 +87,7 @@ class Vector2D:
         if i == 0: self._x = int(value)
         elif i == 1: self._y = int(value)
         else: raise IndexError("Индекс должен быть 0 или 1")
+        self._len = None
 
     def __iter__(self): return iter((self._x, self._y))
 
@@ -78,7 +99,10 @@ class Vector2D:
 
     def __repr__(self): return str(self)
 
-    def __abs__(self): return (self.x**2 + self.y**2) ** 0.5
+    def __abs__(self):
+        if self._len is None:
+            self._len = hypot(self._x, self._y)
+        return self._len
 
     def __add__(self, other): return Vector2D(self.x + other.x, self.y + other.y)
 
@@ -101,6 +125,88 @@ class Vector2D:
     def mixed_product(self, *_): return 0  # В 2D всегда 0
 
 
+if njit is not None:
+    # Сигнатура задана явно, поэтому компиляция происходит при импорте, а не при первом вызове
+    @njit("int64(int32[:], int32[:], int32[:], int32[:])", parallel=True, fastmath=True, cache=True)
+    def _dot_reduce(ax, ay, bx, by):
+        s = 0
+        for i in prange(ax.size):
+            s += ax[i] * bx[i] + ay[i] * by[i]
+        return s
+else:
+    _dot_reduce = None
+
+
+class Vector2DBatch:
+    """Набор векторов, хранящийся как два массива координат (xs, ys) для векторизованных операций."""
+
+    def __init__(self, xs, ys):
+        if np is None:
+            raise ImportError("Vector2DBatch требует установленный numpy")
+        self.xs = np.asarray(xs, dtype=np.int32)
+        self.ys = np.asarray(ys, dtype=np.int32)
+        if self.xs.shape != self.ys.shape:
+            raise ValueError("Массивы xs и ys должны быть одной длины")
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        vectors = list(vectors)
+        return cls([v.x for v in vectors], [v.y for v in vectors])
+
+    @staticmethod
+    def _components(other):
+        if isinstance(other, Vector2DBatch):
+            return other.xs, other.ys
+        if isinstance(other, Vector2D):
+            return other.x, other.y
+        raise TypeError(f"Ожидался Vector2D или Vector2DBatch, получен {type(other).__name__}")
+
+    def __len__(self): return self.xs.size
+
+    def __getitem__(self, i): return Vector2D(int(self.xs[i]), int(self.ys[i]))
+
+    def __iter__(self): return (Vector2D(int(x), int(y)) for x, y in zip(self.xs, self.ys))
+
+    def __str__(self): return f"Vector2DBatch({len(self)} векторов)"
+
+    def __repr__(self): return str(self)
+
+    def __abs__(self): return np.hypot(self.xs, self.ys)
+
+    def __add__(self, other):
+        ox, oy = self._components(other)
+        return Vector2DBatch(self.xs + ox, self.ys + oy)
+
+    def __sub__(self, other):
+        ox, oy = self._components(other)
+        return Vector2DBatch(self.xs - ox, self.ys - oy)
+
+    def __mul__(self, scalar): return Vector2DBatch(self.xs * scalar, self.ys * scalar)
+
+    # Как и Vector2D, результат деления усекается до целых
+    def __truediv__(self, scalar): return Vector2DBatch(self.xs / scalar, self.ys / scalar)
+
+    # Произведения считаются в int64, чтобы не переполнить int32
+    def dot(self, other):
+        ox, oy = self._components(other)
+        return np.multiply(self.xs, ox, dtype=np.int64) + np.multiply(self.ys, oy, dtype=np.int64)
+
+    def cross(self, other):
+        ox, oy = self._components(other)
+        return np.multiply(self.xs, oy, dtype=np.int64) - np.multiply(self.ys, ox, dtype=np.int64)
+
+    def dot_sum(self, other):
+        """Сумма скалярных произведений без промежуточных массивов."""
+        if isinstance(other, Vector2D):
+            return other.x * int(self.xs.sum(dtype=np.int64)) + other.y * int(self.ys.sum(dtype=np.int64))
+        ox, oy = self._components(other)
+        if ox.shape != self.xs.shape:
+            raise ValueError("Пакеты векторов должны быть одной длины")
+        if _dot_reduce is not None:
+            return int(_dot_reduce(self.xs, self.ys, ox, oy))
+        return int(self.dot(other).sum())
+
+
 # Пример использования
 if __name__ == "__main__":
     a = Point2D(100, 150)
@@ -136,3 +242,10 @@ if __name__ == "__main__":
     print(f"Индексация v1: x = {v1[0]}, y = {v1[1]}")
     v1[0] = 7
     print("После изменения v1:", v1)
+
+    if np is not None:
+        batch = Vector2DBatch.from_vectors([v1, v2, Vector2D(1, 1)])
+        print("Пакет векторов:", list(batch + v1))
+        print("Длины векторов пакета:", abs(batch))
+        print("Скалярные произведения с v1:", batch.dot(v1))
+        print("Сумма скалярных произведений с v1:", batch.dot_sum(v1))
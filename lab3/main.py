@@ -1,5 +1,23 @@
-from typing import Protocol, List
-import re, socket
+from typing import Protocol, List, Iterable
+import re, socket, atexit, functools
+
+# Необязательные движки регулярных выражений: RE2 (линейное время, без
+# катастрофического бэктрекинга) и Hyperscan (проверка всех шаблонов за один проход)
+try:
+    import re2 as _re
+except ImportError:
+    _re = re
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Необязательный автомат Ахо — Корасик: поиск всех подстрок SimpleLogFilter за один проход
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # region Protocols
 class LogFilterProtocol(Protocol):
@@ -19,10 +37,22 @@ class SimpleLogFilter:
         return self.pattern in text
 
 
+# Одинаковые шаблоны компилируются один раз, даже если фильтры создаются динамически
+@functools.lru_cache(maxsize=1024)
+def _compile(pattern: str):
+    try:
+        return _re.compile(pattern)
+    except _re.error:
+        # RE2 не поддерживает часть синтаксиса (например, обратные ссылки)
+        if _re is re:
+            raise
+        return re.compile(pattern)
+
+
 class ReLogFilter:
     def __init__(self, pattern: str):
         try:
-            self.pattern = re.compile(pattern)
+            self.pattern = _compile(pattern)
         except re.error as e:
             print(f"\033[91m[REGEX ERROR] Invalid regex pattern: {e}\033[0m")
             self.pattern = None
@@ -35,6 +65,65 @@ class ReLogFilter:
         except Exception as e:
             print(f"\033[91m[REGEX MATCH ERROR] Failed to apply regex: {e}\033[0m")
             return False
+
+
+class _HyperscanMatcher:
+    """Общая база Hyperscan для всех ReLogFilter логгера: один скан вместо N поисков."""
+
+    def __init__(self, filters: List[ReLogFilter]):
+        self.filters = filters
+        self.db = hyperscan.Database()
+        # HS_FLAG_UCP: \w, \s, \b, \d понимают Unicode, как re для str (иначе кириллица не совпадёт)
+        self.db.compile(
+            expressions=[f.pattern.pattern.encode('utf-8') for f in filters],
+            ids=list(range(len(filters))),
+            elements=len(filters),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP] * len(filters),
+        )
+
+    def match(self, text: str) -> bool:
+        found = []
+        try:
+            self.db.scan(text.encode('utf-8'), match_event_handler=lambda *args: found.append(True))
+        except Exception:
+            # Строку не удалось закодировать или просканировать (например, одиночные суррогаты) —
+            # проверяем каждым фильтром по отдельности, как без общей базы
+            return any(f.match(text) for f in self.filters)
+        return bool(found)
+
+
+class _AhoCorasickMatcher:
+    """Один автомат для подстрок всех SimpleLogFilter логгера: проход по строке не зависит от их числа."""
+
+    def __init__(self, filters: List[SimpleLogFilter]):
+        self.automaton = ahocorasick.Automaton()
+        for i, f in enumerate(filters):
+            self.automaton.add_word(f.pattern, i)
+        self.automaton.make_automaton()
+
+    def match(self, text: str) -> bool:
+        return next(self.automaton.iter(text), None) is not None
+
+
+def _combine_filters(filters: List[LogFilterProtocol]) -> List[LogFilterProtocol]:
+    """Заменяет однотипные фильтры одним общим (Hyperscan / Ахо — Корасик), если библиотеки доступны."""
+    combined = list(filters)
+
+    regex_filters = [f for f in filters if isinstance(f, ReLogFilter) and f.pattern is not None]
+    if hyperscan is not None and len(regex_filters) >= 2:
+        try:
+            matcher = _HyperscanMatcher(regex_filters)
+            combined = [f for f in combined if f not in regex_filters] + [matcher]
+        except hyperscan.error:
+            pass  # шаблоны, которые Hyperscan не поддерживает (например, lookaround), проверяются по одному
+
+    # Пустая подстрока совпадает с любой строкой, автомат её не поддерживает
+    simple_filters = [f for f in filters if isinstance(f, SimpleLogFilter)]
+    if ahocorasick is not None and len(simple_filters) >= 2 and all(f.pattern for f in simple_filters):
+        matcher = _AhoCorasickMatcher(simple_filters)
+        combined = [f for f in combined if f not in simple_filters] + [matcher]
+
+    return combined
 # endregion
 
 # region Handlers
@@ -46,28 +135,63 @@ class ConsoleHandler:
 class FileHandler:
     def __init__(self, filename: str):
         self.filename = filename
+        # Файл открывается один раз и пишется через буфер, а не на каждую строку
+        self._f = None
+        self._open()
+
+    def _open(self) -> bool:
+        try:
+            self._f = open(self.filename, 'a', buffering=1 << 16)
+            atexit.register(self._f.close)
+            return True
+        except Exception as e:
+            print(f"\033[91m[FILE ERROR] Failed to open file: {e}\033[0m")
+            return False
 
     def handle(self, text: str) -> None:
+        self.handle_many([text])
+
+    def handle_many(self, texts: List[str]) -> None:
+        # Если файл не открылся раньше (нет каталога, прав), пробуем снова, а не теряем записи молча
+        if self._f is None and not self._open():
+            return
         try:
-            with open(self.filename, 'a') as f:
-                f.write(text + '\n')
+            self._f.write('\n'.join(texts) + '\n')
         except Exception as e:
             print(f"\033[91m[FILE ERROR] Failed to write to file: {e}\033[0m")
 
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            atexit.unregister(self._f.close)
+            self._f = None
+
 
 class SocketHandler:
     def __init__(self, host: str, port: int):
         self.host = host
         self.port = port
+        # Соединение устанавливается при первой записи и переиспользуется; после ошибки — переподключение
+        self._sock = None
 
     def handle(self, text: str) -> None:
+        self.handle_many([text])
+
+    def handle_many(self, texts: List[str]) -> None:
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.connect((self.host, self.port))
-                s.sendall((text + '\n').encode('utf-8'))
+            if self._sock is None:
+                self._sock = socket.create_connection((self.host, self.port))
+                self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sock.sendall(('\n'.join(texts) + '\n').encode('utf-8'))
         except Exception as e:
+            self.close()
             print(f"\033[91m[SOCKET ERROR] Failed to send log: {e}\033[0m")
 
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
 
 class SyslogHandler:
     def handle(self, text: str) -> None:
@@ -79,13 +203,39 @@ class Logger:
     def __init__(self, filters: List[LogFilterProtocol] = None, handlers: List[LogHandlerProtocol] = None):
         self.filters = filters if filters else []
         self.handlers = handlers if handlers else []
+        self._combined_from: List[LogFilterProtocol] = []
+        self._matchers: List[LogFilterProtocol] = []
+
+    def _current_matchers(self) -> List[LogFilterProtocol]:
+        # filters — обычный изменяемый список; общие фильтры пересобираются, если его содержимое изменилось
+        if self.filters != self._combined_from:
+            self._combined_from = list(self.filters)
+            self._matchers = _combine_filters(self.filters)
+        return self._matchers
 
     def log(self, text: str) -> None:
-        if self.filters and not any(f.match(text) for f in self.filters):
+        if self.filters and not any(m.match(text) for m in self._current_matchers()):
             return
 
         for handler in self.handlers:
             handler.handle(text)
+
+    def log_many(self, texts: Iterable[str]) -> None:
+        if self.filters:
+            matchers = self._current_matchers()
+            texts = [t for t in texts if any(m.match(t) for m in matchers)]
+        else:
+            texts = list(texts)
+        if not texts:
+            return
+
+        for handler in self.handlers:
+            handle_many = getattr(handler, "handle_many", None)
+            if handle_many is not None:
+                handle_many(texts)
+            else:
+                for text in texts:
+                    handler.handle(text)
 # endregion
 
 # region Demonstration
@@ -113,18 +263,14 @@ if __name__ == "__main__":
     ]
 
     print("ERROR logs:")
-    for logText in testLogs:
-        errorLogger.log(logText)
+    errorLogger.log_many(testLogs)
 
     print("---------------\nWARNING logs:")
-    for logText in testLogs:
-        warningLogger.log(logText)
+    warningLogger.log_many(testLogs)
 
     print("---------------\nHTTP logs:")
-    for logText in testLogs:
-        httpLogger.log(logText)
+    httpLogger.log_many(testLogs)
 
     print("---------------\nALL logs:")
-    for logText in testLogs:
-        defaultLogger.log(logText)
+    defaultLogger.log_many(testLogs)
 # endregion
@@ -1,8 +1,61 @@
-from typing import Protocol, TypeVar, Generic
+from typing import Callable, Protocol, TypeVar, Generic
+import sys
 
 # Универсальный тип
 T = TypeVar("T")
 
+# Имена свойств интернированы: == для них сразу совпадает по идентичности, но остаётся верным и для чужих строк
+_NAME = sys.intern("name")
+_AGE = sys.intern("age")
+
+
+# --- Дескриптор подписки: позволяет отписаться за O(1) ---
+class ListenerHandle:
+    __slots__ = ("_slots", "_idx")
+
+    def __init__(self, slots: "_ListenerSlots", idx: int):
+        self._slots = slots
+        self._idx = idx
+
+    def cancel(self) -> None:
+        if self._slots is not None:
+            self._slots.cancel(self._idx)
+
+
+# --- Список слушателей: отписка обнуляет ячейку, пустые ячейки периодически удаляются ---
+class _ListenerSlots:
+    def __init__(self):
+        self.fns: list = []
+        self._handles: list = []
+        self._dead = 0
+
+    def add(self, fn: Callable) -> ListenerHandle:
+        handle = ListenerHandle(self, len(self.fns))
+        self.fns.append(fn)
+        self._handles.append(handle)
+        return handle
+
+    def remove(self, fn: Callable) -> None:
+        self.cancel(self.fns.index(fn))
+
+    def cancel(self, idx: int) -> None:
+        self._handles[idx]._slots = None
+        self.fns[idx] = None
+        self._handles[idx] = None
+        self._dead += 1
+        if self._dead * 2 > len(self.fns):
+            self._compact()
+
+    def _compact(self) -> None:
+        # Новые списки вместо изменения старых: уведомление, идущее сейчас, не собьётся
+        fns, handles = [], []
+        for fn, handle in zip(self.fns, self._handles):
+            if fn is not None:
+                handle._idx = len(fns)
+                fns.append(fn)
+                handles.append(handle)
+        self.fns, self._handles, self._dead = fns, handles, 0
+
 
 # --- Интерфейс слушателя изменений ---
 class PropertyChangedListenerProtocol(Protocol[T]):
@@ -12,7 +65,7 @@ class PropertyChangedListenerProtocol(Protocol[T]):
 
 # --- Интерфейс для классов, которые оповещают об изменениях ---
 class DataChangedProtocol(Protocol[T]):
-    def add_property_changed_listener(self, listener: PropertyChangedListenerProtocol[T]) -> None:
+    def add_property_changed_listener(self, listener: PropertyChangedListenerProtocol[T]) -> ListenerHandle:
         ...
     def remove_property_changed_listener(self, listener: PropertyChangedListenerProtocol[T]) -> None:
         ...
@@ -26,7 +79,7 @@ class PropertyChangingListenerProtocol(Protocol[T]):
 
 # --- Интерфейс для классов, поддерживающих валидацию изменений ---
 class DataChangingProtocol(Protocol[T]):
-    def add_property_changing_listener(self, listener: PropertyChangingListenerProtocol[T]) -> None:
+    def add_property_changing_listener(self, listener: PropertyChangingListenerProtocol[T]) -> ListenerHandle:
         ...
     def remove_property_changing_listener(self, listener: PropertyChangingListenerProtocol[T]) -> None:
         ...
@@ -37,34 +90,36 @@ class Person(DataChangedProtocol["Person"], DataChangingProtocol["Person"]):
     def __init__(self, name: str, age: int):
         self._name = name
         self._age = age
-        self._change_listeners: list[PropertyChangedListenerProtocol] = []
-        self._changing_listeners: list[PropertyChangingListenerProtocol] = []
+        # Храним уже привязанные методы слушателей, чтобы не искать их при каждом уведомлении
+        self._on_changed = _ListenerSlots()
+        self._on_changing = _ListenerSlots()
 
     # Добавление/удаление слушателей изменений
-    def add_property_changed_listener(self, listener: PropertyChangedListenerProtocol) -> None:
-        self._change_listeners.append(listener)
+    def add_property_changed_listener(self, listener: PropertyChangedListenerProtocol) -> ListenerHandle:
+        return self._on_changed.add(listener.on_property_changed)
 
     def remove_property_changed_listener(self, listener: PropertyChangedListenerProtocol) -> None:
-        self._change_listeners.remove(listener)
+        self._on_changed.remove(listener.on_property_changed)
 
     # Добавление/удаление слушателей валидации
-    def add_property_changing_listener(self, listener: PropertyChangingListenerProtocol) -> None:
-        self._changing_listeners.append(listener)
+    def add_property_changing_listener(self, listener: PropertyChangingListenerProtocol) -> ListenerHandle:
+        return self._on_changing.add(listener.on_property_changing)
 
     def remove_property_changing_listener(self, listener: PropertyChangingListenerProtocol) -> None:
-        self._changing_listeners.remove(listener)
+        self._on_changing.remove(listener.on_property_changing)
 
     # Уведомление: перед изменением
     def _notify_property_changing(self, property_name: str, old_value, new_value) -> bool:
-        for listener in self._changing_listeners:
-            if not listener.on_property_changing(self, property_name, old_value, new_value):
+        for fn in self._on_changing.fns:
+            if fn is not None and not fn(self, property_name, old_value, new_value):
                 return False
         return True
 
     # Уведомление: после изменения
     def _notify_property_changed(self, property_name: str) -> None:
-        for listener in self._change_listeners:
-            listener.on_property_changed(self, property_name)
+        for fn in self._on_changed.fns:
+            if fn is not None:
+                fn(self, property_name)
 
     # --- Свойство name ---
     @property
@@ -73,9 +128,9 @@ class Person(DataChangedProtocol["Person"], DataChangingProtocol["Person"]):
 
     @name.setter
     def name(self, value: str) -> None:
-        if self._notify_property_changing("name", self._name, value):
+        if self._notify_property_changing(_NAME, self._name, value):
             self._name = value
-            self._notify_property_changed("name")
+            self._notify_property_changed(_NAME)
 
     # --- Свойство age ---
     @property
@@ -84,9 +139,9 @@ class Person(DataChangedProtocol["Person"], DataChangingProtocol["Person"]):
 
     @age.setter
     def age(self, value: int) -> None:
-        if self._notify_property_changing("age", self._age, value):
+        if self._notify_property_changing(_AGE, self._age, value):
             self._age = value
-            self._notify_property_changed("age")
+            self._notify_property_changed(_AGE)
 
     def __str__(self):
         return f"Person(name={self._name}, age={self._age})"
@@ -101,7 +156,7 @@ class PrintListener(PropertyChangedListenerProtocol[Person]):
 # --- Пример валидатора ---
 class AgeValidator(PropertyChangingListenerProtocol[Person]):
     def on_property_changing(self, obj: Person, property_name: str, old_value, new_value) -> bool:
-        if property_name == "age":
+        if property_name == _AGE:
             if not (0 <= new_value <= 120):
                 print(f"[Ошибка] Неверный возраст: {new_value}")
                 return False
@@ -111,7 +166,7 @@ class AgeValidator(PropertyChangingListenerProtocol[Person]):
 # --- Ещё один валидатор ---
 class NameValidator(PropertyChangingListenerProtocol[Person]):
     def on_property_changing(self, obj: Person, property_name: str, old_value, new_value) -> bool:
-        if property_name == "name" and len(new_value.strip()) == 0:
+        if property_name == _NAME and len(new_value.strip()) == 0:
             print(f"[Ошибка] Имя не может быть пустым!")
             return False
         return True
@@ -122,7 +177,7 @@ if __name__ == "__main__":
     p = Person("Alice", 30)
 
     # Добавляем слушателей
-    p.add_property_changed_listener(PrintListener())
+    print_handle = p.add_property_changed_listener(PrintListener())
     p.add_property_changing_listener(AgeValidator())
     p.add_property_changing_listener(NameValidator())
 
@@ -137,3 +192,7 @@ if __name__ == "__main__":
 
     print("\nПопытка изменить имя на '   ':")
     p.name = "   "  # не проходит
+
+    print("\nОтписка PrintListener и изменение возраста на 41:")
+    print_handle.cancel()
+    p.age = 41  # проходит, но уведомления нет
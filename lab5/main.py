@@ -1,14 +1,32 @@
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Optional, Protocol, TypeVar, Generic, Sequence
 import json
+import operator
 import os
 
+# orjson (C-реализация) используется, если установлен; иначе — стандартный json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 T = TypeVar("T")
 
 
-@dataclass(order=True)
+def _dumps(obj, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(slots=True)
 class User:
-    sort_index: str = field(init=False, repr=False)
     id: int
     name: str
     login: str
@@ -16,9 +34,6 @@ class User:
     email: Optional[str] = None
     address: Optional[str] = None
 
-    def __post_init__(self):
-        self.sort_index = self.name
-
 
 class IDataRepository(Protocol, Generic[T]):
     def get_all(self) -> Sequence[T]: ...
@@ -30,29 +45,111 @@ class IDataRepository(Protocol, Generic[T]):
 
 class IUserRepository(IDataRepository[User], Protocol):
     def get_by_login(self, login: str) -> Optional[User]: ...
+    def sorted(self) -> list[User]: ...
 
 
 class DataRepository(Generic[T], IDataRepository[T]):
+    # Сколько записей журнала накапливается до автоматического уплотнения
+    WAL_COMPACT_THRESHOLD = 1000
+
     def __init__(self, filepath: str):
         self.filepath = filepath
+        self.wal_path = filepath + '.wal'
         self._data: list[T] = []
+        self._by_id: dict[int, T] = {}
+        self._pos: dict[int, int] = {}  # id -> позиция в _data, для удаления за O(1)
+        self._wal_size = 0
         self._load()
+        self._wal = open(self.wal_path, 'ab', buffering=1 << 16)
 
     def _load(self):
         if os.path.exists(self.filepath):
             try:
-                with open(self.filepath, 'r', encoding='utf-8') as f:
-                    raw_data = json.load(f)
-                    self._data = [self._deserialize(item) for item in raw_data]
+                with open(self.filepath, 'rb') as f:
+                    raw_data = _loads(f.read())
+                    for raw_item in raw_data:
+                        item = self._deserialize(raw_item)
+                        if item.id in self._pos:
+                            print(f"\033[91m[LOAD ERROR] Duplicate id {item.id} in {self.filepath}, skipped\033[0m")
+                            continue
+                        self._apply_add(item)
             except Exception as e:
                 print(f"\033[91m[LOAD ERROR] Failed to load data from {self.filepath}: {e}\033[0m")
+        self._replay_wal()
 
-    def _save(self):
+    def _replay_wal(self):
+        if not os.path.exists(self.wal_path):
+            return
+        try:
+            with open(self.wal_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    self._wal_size += 1
+                    # Испорченная запись (например, недописанная при сбое) пропускается, остальные применяются
+                    try:
+                        self._replay_record(_loads(line))
+                    except Exception as e:
+                        print(f"\033[91m[LOAD ERROR] Skipped journal record in {self.wal_path}: {e}\033[0m")
+        except Exception as e:
+            print(f"\033[91m[LOAD ERROR] Failed to replay journal {self.wal_path}: {e}\033[0m")
+
+    # Сбой между os.replace в _save и очисткой журнала оставляет в журнале записи, уже вошедшие в снимок,
+    # поэтому повторное воспроизведение должно давать тот же результат
+    def _replay_record(self, record: dict) -> None:
+        op = record["op"]
+        if op == "add":
+            item = self._deserialize(record["item"])
+            if not self._apply_update(item):  # уже есть в снимке — заменяем, а не добавляем второй раз
+                self._apply_add(item)
+        elif op == "update":
+            self._apply_update(self._deserialize(record["item"]))
+        elif op == "delete":
+            self._apply_delete(record["id"])
+
+    def _save(self) -> bool:
+        # Снимок пишется во временный файл и атомарно подменяет старый: недописанный файл не затрёт рабочий
+        tmp_path = self.filepath + '.tmp'
         try:
-            with open(self.filepath, 'w', encoding='utf-8') as f:
-                json.dump([self._serialize(item) for item in self._data], f, ensure_ascii=False, indent=2)
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps([self._serialize(item) for item in self._data], indent=True))
+            os.replace(tmp_path, self.filepath)
+            return True
         except Exception as e:
             print(f"\033[91m[SAVE ERROR] Failed to save data to {self.filepath}: {e}\033[0m")
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    # Вместо перезаписи всего файла каждое изменение дописывается одной строкой в журнал
+    def _journal(self, record: dict) -> None:
+        try:
+            self._wal.write(_dumps(record) + b'\n')
+            self._wal.flush()
+            self._wal_size += 1
+        except Exception as e:
+            print(f"\033[91m[SAVE ERROR] Failed to write journal {self.wal_path}: {e}\033[0m")
+        if self._wal_size >= self.WAL_COMPACT_THRESHOLD:
+            self.compact()
+
+    def compact(self) -> None:
+        """Записывает полный снимок данных и очищает журнал."""
+        if not self._save():
+            return  # журнал остаётся единственной копией изменений
+        try:
+            self._wal.seek(0)
+            self._wal.truncate()
+            self._wal_size = 0
+        except Exception as e:
+            print(f"\033[91m[SAVE ERROR] Failed to truncate journal {self.wal_path}: {e}\033[0m")
+
+    def close(self) -> None:
+        if self._wal.closed:
+            return
+        self.compact()
+        self._wal.close()
+        if os.path.exists(self.wal_path) and os.path.getsize(self.wal_path) == 0:
+            os.remove(self.wal_path)
 
     def _serialize(self, item: T) -> dict:
         return item.__dict__
@@ -60,35 +157,110 @@ class DataRepository(Generic[T], IDataRepository[T]):
     def _deserialize(self, data: dict) -> T:
         raise NotImplementedError
 
+    # Индексы для поиска за O(1) вместо перебора списка
+    def _index(self, item: T) -> None:
+        self._by_id[item.id] = item
+
+    def _unindex(self, item: T) -> None:
+        self._by_id.pop(item.id, None)
+
+    # Изменения в памяти, общие для публичных методов и воспроизведения журнала
+    def _apply_add(self, item: T) -> None:
+        # Повтор id рассинхронизировал бы _data и индексы
+        if item.id in self._pos:
+            raise ValueError(f"Item with id {item.id} already exists")
+        self._pos[item.id] = len(self._data)
+        self._data.append(item)
+        self._index(item)
+
+    def _apply_update(self, item: T) -> bool:
+        i = self._pos.get(item.id)
+        if i is None:
+            return False
+        old = self._data[i]
+        self._data[i] = item
+        self._unindex(old)
+        self._index(item)
+        return True
+
+    # Удаление перестановкой: на место удалённого встаёт последний элемент (порядок не сохраняется)
+    def _apply_delete(self, id: int) -> bool:
+        i = self._pos.pop(id, None)
+        if i is None:
+            return False
+        old = self._data[i]
+        last = self._data.pop()
+        if i < len(self._data):
+            self._data[i] = last
+            self._pos[last.id] = i
+        self._unindex(old)
+        return True
+
     def get_all(self) -> Sequence[T]:
         return self._data
 
     def get_by_id(self, id: int) -> Optional[T]:
-        return next((item for item in self._data if item.id == id), None)
+        return self._by_id.get(id)
 
     def add(self, item: T) -> None:
-        self._data.append(item)
-        self._save()
+        self._apply_add(item)
+        self._journal({"op": "add", "item": self._serialize(item)})
 
     def update(self, item: T) -> None:
-        index = next((i for i, x in enumerate(self._data) if x.id == item.id), -1)
-        if index != -1:
-            self._data[index] = item
-            self._save()
+        if self._apply_update(item):
+            self._journal({"op": "update", "item": self._serialize(item)})
 
     def delete(self, item: T) -> None:
-        self._data = [x for x in self._data if x.id != item.id]
-        self._save()
+        if self._apply_delete(item.id):
+            self._journal({"op": "delete", "id": item.id})
 
 
 class UserRepository(DataRepository[User], IUserRepository):
+    def __init__(self, filepath: str):
+        # Уникальность логинов не требуется: под логином хранятся все его пользователи в порядке добавления
+        self._by_login: dict[str, list[User]] = {}
+        super().__init__(filepath)
+
+    # У User со __slots__ нет __dict__
+    def _serialize(self, item: User) -> dict:
+        return asdict(item)
+
+    def _index(self, item: User) -> None:
+        super()._index(item)
+        self._by_login.setdefault(item.login, []).append(item)
+
+    def _unindex(self, item: User) -> None:
+        super()._unindex(item)
+        login = item.login
+        if not self._drop_login(login, item):
+            # Логин мог быть изменён у объекта напрямую, до вызова update
+            for login in list(self._by_login):
+                if self._drop_login(login, item):
+                    break
+
+    def _drop_login(self, login: str, item: User) -> bool:
+        users = self._by_login.get(login)
+        if users is None:
+            return False
+        for i, user in enumerate(users):
+            if user is item:
+                del users[i]
+                if not users:
+                    del self._by_login[login]
+                return True
+        return False
+
     def _deserialize(self, data: dict) -> User:
         data = dict(data)
         data.pop("sort_index", None)
         return User(**data)
 
     def get_by_login(self, login: str) -> Optional[User]:
-        return next((u for u in self._data if u.login == login), None)
+        users = self._by_login.get(login)
+        return users[0] if users else None
+
+    def sorted(self) -> list[User]:
+        return sorted(self._data, key=operator.attrgetter("name"))
 
 
 class IAuthService(Protocol):
@@ -110,8 +282,8 @@ class AuthService(IAuthService):
     def _load(self):
         if os.path.exists(self.auth_file):
             try:
-                with open(self.auth_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(self.auth_file, 'rb') as f:
+                    data = _loads(f.read())
                     user_id = data.get("user_id")
                     if isinstance(user_id, int):
                         user = self.user_repo.get_by_id(user_id)
@@ -123,8 +295,8 @@ class AuthService(IAuthService):
     def _save(self):
         try:
             if self._current_user:
-                with open(self.auth_file, 'w', encoding='utf-8') as f:
-                    json.dump({"user_id": self._current_user.id}, f, ensure_ascii=False, indent=2)
+                with open(self.auth_file, 'wb') as f:
+                    f.write(_dumps({"user_id": self._current_user.id}, indent=True))
             else:
                 if os.path.exists(self.auth_file):
                     os.remove(self.auth_file)
@@ -172,4 +344,6 @@ if __name__ == "__main__":
     auth2 = AuthService("auth.json", repo)
     print("Автоавторизация:", auth2.is_authorized)
     print("Пользователь:", auth2.current_user)
+
+    repo.close()
 # endregion
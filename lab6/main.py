@@ -1,15 +1,30 @@
+import atexit
 import json
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 from pathlib import Path
 
+# orjson (C-реализация) используется, если установлен; иначе — стандартный json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # === Настройки ===
 
 OUTPUT_FILE = "output.txt"
 
+_out = None
+
+
 def write_to_output(text: str, end: str = "\n"):
-    with open(OUTPUT_FILE, "a", encoding="utf-8") as f:
-        f.write(text + end)
+    # Файл открывается один раз при первой записи; буфер сбрасывается при выходе
+    global _out
+    if _out is None:
+        _out = open(OUTPUT_FILE, "a", encoding="utf-8", buffering=1 << 16)
+        atexit.register(_out.close)
+    _out.write(text)
+    _out.write(end)
 
 
 # ==== Command Pattern ====
@@ -96,13 +111,17 @@ class KeyboardStateSaver:
         self.filepath = Path(filepath)
 
     def save(self, associations: Dict[str, str]):
-        with self.filepath.open("w", encoding="utf-8") as f:
-            json.dump(associations, f)
+        with self.filepath.open("wb") as f:
+            if orjson is not None:
+                f.write(orjson.dumps(associations))
+            else:
+                f.write(json.dumps(associations).encode("utf-8"))
 
     def load(self) -> Dict[str, str]:
         if self.filepath.exists():
-            with self.filepath.open("r", encoding="utf-8") as f:
-                return json.load(f)
+            with self.filepath.open("rb") as f:
+                data = f.read()
+            return orjson.loads(data) if orjson is not None else json.loads(data)
         return {}
 
 
@@ -159,16 +178,17 @@ class Keyboard:
             if command:
                 self.commands[key] = command
 
-    def _create_command_by_name(self, name: str) -> Command:
-        if name == "VolumeUpCommand":
-            return VolumeUpCommand()
-        elif name == "VolumeDownCommand":
-            return VolumeDownCommand()
-        elif name == "MediaPlayerCommand":
-            return MediaPlayerCommand()
-        elif name == "PrintCommand":
-            return PrintCommand("*", self.text_output)  # заглушка
-        return None
+    # Имя класса команды -> фабрика, создающая команду для данной клавиатуры
+    _COMMAND_FACTORIES: Dict[str, Callable[["Keyboard"], Command]] = {
+        "VolumeUpCommand": lambda kb: VolumeUpCommand(),
+        "VolumeDownCommand": lambda kb: VolumeDownCommand(),
+        "MediaPlayerCommand": lambda kb: MediaPlayerCommand(),
+        "PrintCommand": lambda kb: PrintCommand("*", kb.text_output),  # заглушка
+    }
+
+    def _create_command_by_name(self, name: str) -> Optional[Command]:
+        factory = self._COMMAND_FACTORIES.get(name)
+        return factory(self) if factory else None
 
 
 # ==== Пример использования ====
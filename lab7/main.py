@@ -1,6 +1,7 @@
 from enum import Enum, auto
-from typing import Any, Callable, Dict, Optional, Type
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 from contextlib import contextmanager
+import functools
 import inspect
 
 # Жизненные циклы
@@ -9,67 +10,261 @@ class LifeStyle(Enum):
     Scoped = auto()
     Singleton = auto()
 
+# План конструирования: (имя параметра, аннотация, есть ли значение по умолчанию, можно ли передать
+# позиционно) для каждого аргумента __init__. Сигнатура разбирается один раз на класс.
+# *args/**kwargs в план не попадают, поэтому при разрешении зависимостей вид параметра уже не проверяется.
+_VARIADIC_KINDS = frozenset((inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD))
+_POSITIONAL_KINDS = frozenset((inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD))
+
+@functools.lru_cache(maxsize=None)
+def _build_plan(implementation: Type) -> Tuple[Tuple[str, Any, Any, Any], ...]:
+    sig = inspect.signature(implementation.__init__)
+    # Строковые аннотации (from __future__ import annotations) превращаются в классы один раз здесь.
+    # Каждая разбирается отдельно: одна неразрешимая не мешает остальным, а get_type_hints на 3.10
+    # превратил бы `dep: C = None` в Optional[C], и зависимость C перестала бы находиться
+    globalns = getattr(implementation.__init__, '__globals__', {})
+
+    def resolve(annotation):
+        if isinstance(annotation, str):
+            try:
+                return eval(annotation, globalns)
+            except Exception:
+                pass
+        return annotation
+
+    return tuple(
+        (name, resolve(param.annotation), param.default, param.kind)
+        for name, param in sig.parameters.items()
+        if name != 'self' and param.kind not in _VARIADIC_KINDS
+    )
+
+# Маркер отсутствующего значения (None тоже может быть зарегистрированным экземпляром)
+_MISSING = object()
+
+# Значения этих типов можно безопасно встроить в сгенерированный код через repr
+_LITERAL_TYPES = (bool, int, str, type(None))
+
+# Сколько экземпляров одного интерфейса может храниться в пуле между областями
+_POOL_MAX_SIZE = 8
+
+# Циклическая зависимость между регистрациями
+class CycleError(ValueError):
+    pass
+
+# Регистрация интерфейса в контейнере
+class Registration:
+    __slots__ = ('implementation', 'lifestyle', 'params', 'factory', 'plan', 'reset')
+
+    def __init__(self, implementation: Optional[Type], lifestyle: LifeStyle, params: Dict[str, Any],
+                 factory: Optional[Callable[[], Any]], plan: Tuple[Tuple[str, Any, Any, Any], ...],
+                 reset: Optional[Callable[[Any], None]] = None):
+        self.implementation = implementation
+        self.lifestyle = lifestyle
+        self.params = params
+        self.factory = factory
+        self.plan = plan
+        self.reset = reset  # вызывается перед возвратом poolable-экземпляра в пул
+
 # DI-контейнер
 class Injector:
+    __slots__ = ('_registrations', '_dispatch', '_factories', '_singletons',
+                 '_scoped_instances', '_scope_depth', '_pool')
+
     def __init__(self):
-        self._registrations = {}  # интерфейс -> (класс, lifestyle, params, factory)
+        self._registrations: Dict[Type, Registration] = {}
+        # Ключи — сами классы: их хеш уже считается по адресу, а вызов id(interface) лишь добавляет накладные расходы
+        self._dispatch = {}  # интерфейс -> _get_per_request / _get_singleton / _get_scoped
+        self._factories = {}  # интерфейс -> функция без аргументов, возвращающая экземпляр
         self._singletons = {}
         self._scoped_instances = {}
-        self._scope_active = False
+        self._scope_depth = 0  # вложенность create_scope; экземпляры Scoped живут до выхода из внешней области
+        self._pool = {}  # poolable-интерфейс -> экземпляры, освободившиеся после выхода из области
 
     def register(self, interface: Type, implementation: Optional[Type] = None,
                  lifestyle: LifeStyle = LifeStyle.PerRequest,
                  params: Optional[Dict[str, Any]] = None,
-                 factory: Optional[Callable[[], Any]] = None):
-        self._registrations[interface] = (implementation, lifestyle, params or {}, factory)
+                 factory: Optional[Callable[[], Any]] = None,
+                 poolable: bool = False,
+                 reset: Optional[Callable[[Any], None]] = None):
+        if poolable and lifestyle is not LifeStyle.Scoped:
+            raise ValueError("Only Scoped registrations can be poolable")
+        plan = _build_plan(implementation) if implementation is not None and factory is None else ()
+        self._registrations[interface] = Registration(implementation, lifestyle, params or {}, factory, plan, reset)
+        self._dispatch[interface] = self._RESOLVERS[lifestyle]
+        self._singletons.pop(interface, None)
+        self._pool.pop(interface, None)
+        if poolable:
+            self._pool[interface] = []
+        # Сгенерированные конструкторы ссылаются на способы получения зависимостей напрямую,
+        # поэтому после перерегистрации их нужно собрать заново
+        self._factories.clear()
+
+    def build(self) -> None:
+        """Заранее собирает фабрики всех регистраций; ошибки конфигурации возникают здесь, а не в get_instance."""
+        self._check_cycles(self._registrations)
+        for interface in self._registrations:
+            self._factory(interface, check_cycles=False)
+
+    def _check_cycles(self, roots) -> None:
+        # Поиск в глубину по зависимостям; вместо бесконечной рекурсии при разрешении — понятная ошибка
+        done = set()
+        path = []
+
+        def visit(interface):
+            if interface in done:
+                return
+            if interface in path:
+                cycle = path[path.index(interface):] + [interface]
+                raise CycleError("Dependency cycle: " + " -> ".join(i.__name__ for i in cycle))
+            path.append(interface)
+            reg = self._registrations[interface]
+            if reg.factory is None:
+                for _, _, kind, data in self._resolve_plan(reg):
+                    if kind == "child":
+                        visit(data)
+            path.pop()
+            done.add(interface)
+
+        for interface in roots:
+            visit(interface)
 
     def get_instance(self, interface: Type):
-        if interface not in self._registrations:
+        resolve = self._dispatch.get(interface)
+        if resolve is None:
             raise ValueError(f"Interface {interface} not registered")
+        return resolve(self, interface)
+
+    # Способ получения экземпляра выбирается один раз при регистрации, а не сравнением LifeStyle на каждый вызов
+    def _get_per_request(self, interface: Type):
+        return self._factory(interface)()
 
-        implementation, lifestyle, params, factory = self._registrations[interface]
+    def _get_singleton(self, interface: Type):
+        # Фабрика Singleton после первого вызова сама заменяется на возврат готового объекта
+        return self._factory(interface)()
 
-        if lifestyle == LifeStyle.Singleton:
-            if interface not in self._singletons:
-                self._singletons[interface] = self._create_instance(interface, implementation, params, factory)
-            return self._singletons[interface]
+    def _get_scoped(self, interface: Type):
+        if not self._scope_depth:
+            raise RuntimeError("Scoped instance requested outside of scope")
+        scoped = self._scoped_instances
+        value = scoped.get(interface, _MISSING)
+        if value is _MISSING:
+            pool = self._pool.get(interface)
+            value = pool.pop() if pool else self._factory(interface)()
+            scoped[interface] = value
+        return value
 
-        if lifestyle == LifeStyle.Scoped:
-            if not self._scope_active:
-                raise RuntimeError("Scoped instance requested outside of scope")
-            if interface not in self._scoped_instances:
-                self._scoped_instances[interface] = self._create_instance(interface, implementation, params, factory)
-            return self._scoped_instances[interface]
+    _RESOLVERS = {
+        LifeStyle.PerRequest: _get_per_request,
+        LifeStyle.Singleton: _get_singleton,
+        LifeStyle.Scoped: _get_scoped,
+    }
 
-        return self._create_instance(interface, implementation, params, factory)
+    def _factory(self, interface: Type, check_cycles: bool = True) -> Callable[[], Any]:
+        factory = self._factories.get(interface)
+        if factory is None:
+            # Граф проверяется один раз на верхнем промахе; вложенные сборки его уже не обходят
+            if check_cycles:
+                self._check_cycles((interface,))
+            factory = self._factories[interface] = self._build_factory(interface)
+        return factory
 
-    def _create_instance(self, interface: Type, implementation: Type, params: Dict[str, Any], factory: Optional[Callable]):
-        if factory:
-            return factory()
+    def _build_factory(self, interface: Type) -> Callable[[], Any]:
+        reg = self._registrations[interface]
+        value = self._singletons.get(interface, _MISSING)
+        if value is not _MISSING:
+            return lambda _v=value: _v
+        create = self._compile_constructor(reg)
+        if reg.lifestyle is not LifeStyle.Singleton:
+            return create
+
+        def singleton():
+            value = self._singletons[interface] = create()
+            # После создания и фабрика, и запись в _dispatch просто возвращают готовый объект:
+            # get_instance для Singleton — один поиск в словаре и один вызов
+            self._factories[interface] = lambda _v=value: _v
+            self._dispatch[interface] = lambda _inj, _interface, _v=value: _v
+            return value
+        return singleton
+
+    def _resolve_plan(self, reg: Registration) -> Tuple[Tuple[str, bool, str, Any], ...]:
+        """Классифицирует параметры конструктора: (имя, позиционно ли, "const", значение) или (..., "child", интерфейс)."""
+        resolved = []
+        positional = True  # позиционно передаются аргументы до первого пропущенного или keyword-only
+        for name, annotation, default, param_kind in reg.plan:
+            positional = positional and param_kind in _POSITIONAL_KINDS
+            if name in reg.params:
+                resolved.append((name, positional, "const", reg.params[name]))
+            elif annotation in self._registrations:
+                resolved.append((name, positional, "child", annotation))
+            elif default is not inspect.Parameter.empty:
+                if param_kind is inspect.Parameter.POSITIONAL_ONLY:
+                    # Позиционно-только параметр нельзя пропустить по имени — передаём его значение по умолчанию
+                    resolved.append((name, True, "const", default))
+                else:  # используется значение по умолчанию из __init__
+                    positional = False
+            else:
+                raise ValueError(f"Cannot resolve dependency '{name}' of {reg.implementation}")
+        return tuple(resolved)
 
-        sig = inspect.signature(implementation.__init__)
-        kwargs = {}
-        for name, param in sig.parameters.items():
-            if name == 'self' or param.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+    def _compile_constructor(self, reg: Registration) -> Callable[[], Any]:
+        """Генерирует конструктор вида `_impl(_F[_t0](), _r1(_inj, _t1), level=5)` без рефлексии при вызове."""
+        if reg.factory:
+            return reg.factory
+
+        namespace = {"_impl": reg.implementation, "_inj": self, "_F": self._factories}
+        args = []
+        for i, (name, positional, kind, data) in enumerate(self._resolve_plan(reg)):
+            # Позиционная передача обходит разбор именованных аргументов при вызове
+            prefix = "" if positional else f"{name}="
+            if kind == "const":
+                if type(data) in _LITERAL_TYPES:
+                    args.append(f"{prefix}{data!r}")
+                else:
+                    namespace[f"_p{i}"] = data
+                    args.append(f"{prefix}_p{i}")
                 continue
 
-            if name in params:
-                kwargs[name] = params[name]
-            elif param.annotation in self._registrations:
-                kwargs[name] = self.get_instance(param.annotation)
+            namespace[f"_t{i}"] = data
+            resolve = self._dispatch[data]
+            if resolve is Injector._get_scoped:
+                # Scoped требует проверки активной области
+                namespace[f"_r{i}"] = resolve
+                args.append(f"{prefix}_r{i}(_inj, _t{i})")
             else:
-                raise ValueError(f"Cannot resolve dependency '{name}' of {implementation}")
-        return implementation(**kwargs)
+                # PerRequest и Singleton — прямой вызов фабрики из живого словаря _factories
+                # (фабрика Singleton после первого вызова возвращает готовый объект)
+                self._factory(data, check_cycles=False)
+                args.append(f"{prefix}_F[_t{i}]()")
+
+        # Аргументы записаны прямо в вызове, поэтому промежуточный словарь kwargs не создаётся
+        source = f"def factory():\n    return _impl({', '.join(args)})\n"
+        exec(source, namespace)
+        return namespace["factory"]
 
     @contextmanager
     def create_scope(self):
+        # Вложенная область использует экземпляры внешней; словарь очищается, а не создаётся заново
+        self._scope_depth += 1
         try:
-            self._scope_active = True
-            self._scoped_instances = {}
             yield self
         finally:
-            self._scope_active = False
-            self._scoped_instances = {}
+            self._scope_depth -= 1
+            if not self._scope_depth:
+                self._release_scoped()
+
+    def _release_scoped(self) -> None:
+        # Тяжёлые poolable-экземпляры возвращаются в пул для следующей области
+        # Даже если reset упал, область должна быть очищена
+        try:
+            for interface, value in self._scoped_instances.items():
+                pool = self._pool.get(interface)
+                if pool is not None and len(pool) < _POOL_MAX_SIZE:
+                    reset = self._registrations[interface].reset
+                    if reset is not None:
+                        reset(value)
+                    pool.append(value)
+        finally:
+            self._scoped_instances.clear()
 
 # ===== Интерфейсы =====
 class Interface1:
@@ -137,6 +332,8 @@ def configure(injector: Injector):
         lifestyle=LifeStyle.PerRequest
     )
 
+    injector.build()
+
 # ===== Демонстрация =====
 def main():
     injector = Injector()
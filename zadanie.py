@@ -1,33 +1,82 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
 import nltk
 from nltk.corpus import stopwords
 import string
 
-# Загрузка стоп-слов
-nltk.download('stopwords')
-stop_words = stopwords.words('russian') + stopwords.words('english')  # Можно выбрать язык
+# Numba (если установлен) компилирует выбор топ-N в машинный код; без него работает тот же код на NumPy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Загрузка стоп-слов: скачиваем только если корпуса ещё нет локально
+def _ensure_stopwords():
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('stopwords', quiet=True)
+
+
+_ensure_stopwords()
+stop_words = frozenset(stopwords.words('russian')) | frozenset(stopwords.words('english'))  # Можно выбрать язык
+
+# Векторизатор создаётся один раз; fit_transform на новом тексте заново строит словарь
+_VECTORIZER = TfidfVectorizer(stop_words=list(stop_words), ngram_range=(1, 2))  # 1- и 2-граммы
+
+# Таблицы для очистки текста строятся один раз при импорте
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+_ASCII_LOWER_TABLE = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+_ASCII_PUNCT = string.punctuation.encode('ascii')
+
+
+def _clean_text(text):
+    # ASCII-текст обрабатывается одним проходом bytes.translate (нижний регистр + удаление пунктуации)
+    if text.isascii():
+        return text.encode('ascii').translate(_ASCII_LOWER_TABLE, _ASCII_PUNCT).decode('ascii')
+    return text.lower().translate(_PUNCT_TABLE)
+
+
+def _top_k(scores, indices, k):
+    # Порог k-го веса находится за O(V), сортируются только кандидаты не ниже порога
+    # (при равных весах — по индексу признака, т.е. по алфавиту, как и при полной сортировке)
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    threshold = np.partition(scores, scores.size - k)[scores.size - k]
+    top = np.flatnonzero(scores >= threshold)
+    top = top[np.argsort(indices[top], kind='mergesort')]
+    top = top[np.argsort(-scores[top], kind='mergesort')]
+    return top[:k]
+
+
+if njit is not None:
+    _top_k = njit(cache=True)(_top_k)
 
 
 # === Функция обработки текста ===
 def extract_keywords(text, top_n=10):
     # Очистка текста
-    text = text.lower().translate(str.maketrans('', '', string.punctuation))
+    text = _clean_text(text)
 
     # Векторизация TF-IDF
-    vectorizer = TfidfVectorizer(stop_words=stop_words, ngram_range=(1, 2))  # 1- и 2-граммы
+    vectorizer = _VECTORIZER
     tfidf_matrix = vectorizer.fit_transform([text])
 
-    # Получаем слова и их веса
-    feature_array = vectorizer.get_feature_names_out()
-    tfidf_scores = tfidf_matrix.toarray()[0]
+    # Берём ненулевые веса прямо из разреженной матрицы, без toarray()
+    scores = tfidf_matrix.data
+    indices = tfidf_matrix.indices
 
-    # Соединяем и сортируем
-    word_score_pairs = list(zip(feature_array, tfidf_scores))
-    sorted_keywords = sorted(word_score_pairs, key=lambda x: x[1], reverse=True)
+    # Частичная сортировка вместо полной
+    order = _top_k(scores, indices, min(top_n, scores.size))
+    # Декодируем только k победителей, без сортировки всего словаря
+    top_indices = indices[order].tolist()
+    wanted = set(top_indices)
+    terms = {i: t for t, i in vectorizer.vocabulary_.items() if i in wanted}
+    top_words = [terms[i] for i in top_indices]
 
     # Вывод
     print("🔑 Топ ключевых слов и фраз:")
-    for word, score in sorted_keywords[:top_n]:
+    for word, score in zip(top_words, scores[order]):
         print(f"{word:<25} — вес: {score:.4f}")
 
 